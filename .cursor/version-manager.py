@@ -7,17 +7,100 @@ Handles automatic version management, schema validation, and metadata updates
 import os
 import sys
 import json
-import yaml
 import hashlib
 import datetime
 import re
-import argparse
-import semantic_version
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+# Third-party modules are imported on first use so --help and fast paths stay cheap
+@functools.lru_cache(maxsize=None)
+def _get_yaml() -> Tuple[Any, Any, Any]:
+    """Import PyYAML, preferring the libyaml-backed loader/dumper"""
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    except ImportError:
+        from yaml import SafeLoader, SafeDumper
+    return yaml, SafeLoader, SafeDumper
+
+def _yaml_load(stream: Any) -> Any:
+    yaml, loader, _ = _get_yaml()
+    return yaml.load(stream, Loader=loader)
+
+def _yaml_dump(data: Any) -> bytes:
+    yaml, _, dumper = _get_yaml()
+    return yaml.dump(data, Dumper=dumper, default_flow_style=False, sort_keys=False).encode()
+
+@functools.lru_cache(maxsize=None)
+def _get_jsonschema() -> Optional[Any]:
+    """Import jsonschema if available"""
+    try:
+        import jsonschema
+        return jsonschema
+    except ImportError:
+        print("Warning: jsonschema not installed. Schema validation disabled.")
+        return None
+
+# Prefer orjson for the version database; fall back to the stdlib encoder
+try:
+    import orjson
+    
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+
+# Stands in for metadata.checksum while a document is rendered and hashed;
+# being all digits, the dumper always quotes it
+CHECKSUM_PLACEHOLDER = '0' * 16
+
+# MAJOR.MINOR.PATCH with optional -prerelease and +build suffixes
+VERSION_RE = re.compile(r'^(\d+)\.(\d+)\.(\d+)(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$')
+
+def _iter_yaml_files(root: str):
+    """Yield paths of YAML files under root as strings, skipping hidden directories"""
+    # Unreadable directories are skipped, as Path.rglob does
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith('.'):
+                    yield from _iter_yaml_files(entry.path)
+            elif entry.name.endswith('.yaml') and entry.is_file():
+                yield entry.path
+
+# Below this many files, worker process startup costs more than it saves
+MIN_PARALLEL_FILES = 4
+
+_worker_manager: Optional['AutoVersionManager'] = None
+
+def _init_worker(workspace_root: Path, run_now: datetime.datetime):
+    """Build a per-process manager so schemas are loaded once per worker"""
+    global _worker_manager
+    # Each task carries its own version database entry, so workers skip loading it
+    _worker_manager = AutoVersionManager(workspace_root, run_now, version_db={})
+
+def _prepare_in_worker(task: Tuple) -> Tuple[bool, Optional['FileUpdate']]:
+    """Run a prepare method on the worker's manager"""
+    prepare, *args = task
+    return getattr(_worker_manager, prepare)(*args)
+
 class ChangeType(Enum):
     """Types of changes for version calculation"""
     MAJOR = "major"
@@ -35,33 +118,61 @@ class VersionInfo:
     change_type: Optional[str] = None
     changelog: Optional[List[str]] = None
 
+@dataclass
+class FileUpdate:
+    """Prepared update for a single file, applied by the main process"""
+    path: Path
+    file_key: str
+    info: Dict
+    content: bytes
+    message: str
+
 class SchemaValidator:
     """Schema validation for rules and agent specs"""
     
     def __init__(self, schema_dir: Path):
         self.schema_dir = schema_dir
+        self.schema_paths = {
+            'cursor-rule': schema_dir / 'cursor-rule-schema.yaml',
+            'agent-spec': schema_dir / 'agent-spec-schema.yaml'
+        }
         self.schemas = {}
-        self._load_schemas()
+        self.validators = {}
     
-    def _load_schemas(self):
-        """Load all schema files"""
-        try:
-            import jsonschema
-            self.jsonschema = jsonschema
-        except ImportError:
-            print("Warning: jsonschema not installed. Schema validation disabled.")
-            self.jsonschema = None
+    def _load_schema(self, schema_name: str):
+        """Load a schema file and compile its validator the first time it is needed"""
+        if schema_name in self.validators:
             return
         
-        schema_files = {
-            'cursor-rule': self.schema_dir / 'cursor-rule-schema.yaml',
-            'agent-spec': self.schema_dir / 'agent-spec-schema.yaml'
-        }
+        self.validators[schema_name] = None
+        schema_path = self.schema_paths[schema_name]
+        if not schema_path.exists():
+            return
         
-        for schema_name, schema_path in schema_files.items():
-            if schema_path.exists():
-                with open(schema_path, 'r') as f:
-                    self.schemas[schema_name] = yaml.safe_load(f)
+        # A schema that exists but cannot be read stays cached without a
+        # validator, so every file validated against it fails
+        try:
+            with open(schema_path, 'r') as f:
+                self.schemas[schema_name] = _yaml_load(f)
+        except Exception as e:
+            self.schemas[schema_name] = None
+            print(f"Warning: could not load {schema_name} schema: {e}")
+            return
+        self._compile_validator(schema_name)
+    
+    def _compile_validator(self, schema_name: str):
+        """Check a schema once and cache a validator instance for it"""
+        jsonschema = _get_jsonschema()
+        schema = self.schemas[schema_name]
+        if not isinstance(schema, dict):
+            print(f"Warning: invalid {schema_name} schema: expected a mapping")
+            return
+        try:
+            validator_cls = jsonschema.validators.validator_for(schema)
+            validator_cls.check_schema(schema)
+            self.validators[schema_name] = validator_cls(schema)
+        except jsonschema.SchemaError as e:
+            print(f"Warning: invalid {schema_name} schema: {e.message}")
     
     def validate_cursor_rule(self, rule_data: Dict) -> Tuple[bool, List[str]]:
         """Validate cursor rule against schema"""
@@ -73,21 +184,30 @@ class SchemaValidator:
     
     def _validate_against_schema(self, data: Dict, schema_name: str) -> Tuple[bool, List[str]]:
         """Validate data against specified schema"""
-        if not self.jsonschema or schema_name not in self.schemas:
+        if not _get_jsonschema():
             return True, []
         
-        try:
-            self.jsonschema.validate(data, self.schemas[schema_name])
+        self._load_schema(schema_name)
+        if schema_name not in self.schemas:
             return True, []
-        except self.jsonschema.ValidationError as e:
-            return False, [str(e)]
+        
+        validator = self.validators.get(schema_name)
+        if validator is None:
+            return False, [f"Schema validation error: invalid {schema_name} schema"]
+        
+        try:
+            # str() of a ValidationError embeds the whole schema and instance
+            errors = [f"{'/'.join(map(str, e.absolute_path)) or '<root>'}: {e.message}"
+                      for e in validator.iter_errors(data)]
+            return not errors, errors
         except Exception as e:
             return False, [f"Schema validation error: {str(e)}"]
 
 class AutoVersionManager:
     """Automatic version management system"""
     
-    def __init__(self, workspace_root: Path):
+    def __init__(self, workspace_root: Path, run_now: Optional[datetime.datetime] = None,
+                 version_db: Optional[Dict] = None):
         self.workspace_root = workspace_root
         self.cursor_rules_dir = workspace_root / '.cursor' / 'rules'
         self.agent_specs_dir = workspace_root / 'agents'
@@ -95,129 +215,180 @@ class AutoVersionManager:
         self.version_db_path = workspace_root / '.cursor' / 'version_db.json'
         
         self.validator = SchemaValidator(self.schema_dir)
-        self.version_db = self._load_version_db()
+        self.version_db = self._load_version_db() if version_db is None else version_db
+        self._dirty = False
+        # One timestamp per run so files touched together share a modified time
+        self._run_now = run_now or datetime.datetime.now(datetime.timezone.utc)
     
     def _load_version_db(self) -> Dict:
         """Load version database"""
         if self.version_db_path.exists():
-            with open(self.version_db_path, 'r') as f:
-                return json.load(f)
+            return _json_loads(self.version_db_path.read_bytes())
         return {}
     
     def _save_version_db(self):
-        """Save version database"""
+        """Save version database atomically, skipping the write when nothing changed"""
+        if not self._dirty:
+            return
+        
         self.version_db_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.version_db_path, 'w') as f:
-            json.dump(self.version_db, f, indent=2)
+        tmp_path = self.version_db_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(_json_dumps(self.version_db))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.version_db_path)
+        self._dirty = False
+    
+    def _calculate_checksum(self, content: bytes) -> str:
+        """Calculate SHA256 checksum of raw file content"""
+        return hashlib.sha256(content).hexdigest()[:16]
+    
+    def _render(self, data: Dict) -> bytes:
+        """Render a document whose metadata.checksum covers its own content
+        
+        The checksum is taken over the document rendered with CHECKSUM_PLACEHOLDER
+        in its place and then spliced into that same output, so one dump serves
+        both hashing and writing.
+        """
+        data['metadata']['checksum'] = CHECKSUM_PLACEHOLDER
+        out = _yaml_dump(data)
+        checksum = self._calculate_checksum(out)
+        data['metadata']['checksum'] = checksum
+        
+        placeholder = f"'{CHECKSUM_PLACEHOLDER}'".encode()
+        if out.count(placeholder) == 1:
+            return out.replace(placeholder, f"'{checksum}'".encode())
+        # The placeholder text also occurs elsewhere in the document
+        return _yaml_dump(data)
+    
+    def _summarize(self, data: Dict) -> Dict:
+        """Project the fields used to classify changes between versions"""
+        # Metadata is excluded from comparison
+        compare = {k: v for k, v in data.items() if k != 'metadata'}
+        return {
+            'caps': sorted(compare.get('capabilities', {}).get('primary', [])),
+            'n_objectives': len(compare.get('objectives', [])),
+            'guidelines_len': len(str(compare.get('guidelines', {}))),
+            'priority': compare.get('spec', {}).get('priority'),
+            'has_required': self._has_key(compare, 'required'),
+        }
     
-    def _calculate_checksum(self, content: str) -> str:
-        """Calculate SHA256 checksum of content"""
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+    def _previous_summary(self, current_info: Dict) -> Dict:
+        """Get the summary recorded for a file, deriving it from entries that still store full data"""
+        if 'summary' in current_info:
+            return current_info['summary']
+        return self._summarize(current_info.get('data', {}))
     
-    def _determine_version_bump(self, file_path: Path, old_data: Dict, new_data: Dict) -> ChangeType:
+    def _determine_version_bump(self, file_path: Path, old_summary: Dict, new_summary: Dict) -> ChangeType:
         """Determine version bump type based on changes"""
-        # Remove metadata for comparison
-        old_compare = {k: v for k, v in old_data.items() if k != 'metadata'}
-        new_compare = {k: v for k, v in new_data.items() if k != 'metadata'}
+        # Identical projections cannot add or break anything
+        if old_summary == new_summary:
+            return ChangeType.PATCH
+        
+        caps_removed, caps_added = self._capability_delta(old_summary, new_summary)
         
         # Check for breaking changes
-        if self._has_breaking_changes(old_compare, new_compare):
+        if self._has_breaking_changes(old_summary, new_summary, caps_removed):
             return ChangeType.MAJOR
         
         # Check for new features
-        if self._has_new_features(old_compare, new_compare):
+        if self._has_new_features(old_summary, new_summary, caps_added):
             return ChangeType.MINOR
         
         # Default to patch
         return ChangeType.PATCH
     
-    def _has_breaking_changes(self, old_data: Dict, new_data: Dict) -> bool:
+    def _has_breaking_changes(self, old_summary: Dict, new_summary: Dict, caps_removed: bool) -> bool:
         """Check if changes are breaking"""
-        breaking_changes = [
-            # Schema changes
-            'required' in str(old_data) and 'required' not in str(new_data),
-            # Priority changes in agent specs
-            old_data.get('spec', {}).get('priority') != new_data.get('spec', {}).get('priority'),
+        return (
             # Capability removals
-            self._capabilities_removed(old_data, new_data),
+            caps_removed
+            # Priority changes in agent specs
+            or old_summary.get('priority') != new_summary.get('priority')
             # Objective removals
-            self._objectives_removed(old_data, new_data),
-        ]
-        return any(breaking_changes)
+            or new_summary.get('n_objectives', 0) < old_summary.get('n_objectives', 0)
+            # Schema changes
+            or (old_summary.get('has_required', False) and not new_summary.get('has_required', False))
+        )
     
-    def _has_new_features(self, old_data: Dict, new_data: Dict) -> bool:
+    def _has_new_features(self, old_summary: Dict, new_summary: Dict, caps_added: bool) -> bool:
         """Check if changes add new features"""
-        new_features = [
+        return (
             # New capabilities
-            self._capabilities_added(old_data, new_data),
+            caps_added
             # New objectives
-            self._objectives_added(old_data, new_data),
+            or new_summary.get('n_objectives', 0) > old_summary.get('n_objectives', 0)
             # New guidelines
-            self._guidelines_added(old_data, new_data),
-        ]
-        return any(new_features)
-    
-    def _capabilities_removed(self, old_data: Dict, new_data: Dict) -> bool:
-        """Check if capabilities were removed"""
-        old_caps = set(old_data.get('capabilities', {}).get('primary', []))
-        new_caps = set(new_data.get('capabilities', {}).get('primary', []))
-        return len(old_caps - new_caps) > 0
-    
-    def _objectives_removed(self, old_data: Dict, new_data: Dict) -> bool:
-        """Check if objectives were removed"""
-        old_objs = len(old_data.get('objectives', []))
-        new_objs = len(new_data.get('objectives', []))
-        return new_objs < old_objs
-    
-    def _capabilities_added(self, old_data: Dict, new_data: Dict) -> bool:
-        """Check if capabilities were added"""
-        old_caps = set(old_data.get('capabilities', {}).get('primary', []))
-        new_caps = set(new_data.get('capabilities', {}).get('primary', []))
-        return len(new_caps - old_caps) > 0
-    
-    def _objectives_added(self, old_data: Dict, new_data: Dict) -> bool:
-        """Check if objectives were added"""
-        old_objs = len(old_data.get('objectives', []))
-        new_objs = len(new_data.get('objectives', []))
-        return new_objs > old_objs
-    
-    def _guidelines_added(self, old_data: Dict, new_data: Dict) -> bool:
-        """Check if guidelines were added"""
-        old_guidelines = len(str(old_data.get('guidelines', {})))
-        new_guidelines = len(str(new_data.get('guidelines', {})))
-        return new_guidelines > old_guidelines
+            or new_summary.get('guidelines_len', 0) > old_summary.get('guidelines_len', 0)
+        )
+    
+    def _has_key(self, data: Any, key: str) -> bool:
+        """Check if a key appears anywhere in a nested structure"""
+        if isinstance(data, dict):
+            return key in data or any(self._has_key(v, key) for v in data.values())
+        if isinstance(data, list):
+            return any(self._has_key(v, key) for v in data)
+        return False
+    
+    def _capability_delta(self, old_summary: Dict, new_summary: Dict) -> Tuple[bool, bool]:
+        """Check if primary capabilities were removed and/or added"""
+        old_caps = set(old_summary.get('caps', []))
+        new_caps = set(new_summary.get('caps', []))
+        return bool(old_caps - new_caps), bool(new_caps - old_caps)
     
     def _bump_version(self, current_version: str, change_type: ChangeType) -> str:
         """Bump version based on change type"""
         if not current_version or current_version == "0.0.0":
             return "1.0.0"
         
-        try:
-            # Handle both vX.Y.Z and X.Y.Z formats
-            version_str = current_version.lstrip('v')
-            version = semantic_version.Version(version_str)
-            
-            if change_type == ChangeType.MAJOR:
-                new_version = version.next_major()
-            elif change_type == ChangeType.MINOR:
-                new_version = version.next_minor()
-            else:  # PATCH
-                new_version = version.next_patch()
-            
-            return str(new_version)
-        except Exception as e:
-            print(f"Error bumping version {current_version}: {e}")
-            return "1.0.0"
+        # Handle both vX.Y.Z and X.Y.Z formats; anything else fails the file
+        # rather than resetting its version
+        match = VERSION_RE.match(current_version.lstrip('v'))
+        if not match:
+            raise ValueError(f"cannot bump version {current_version}: expected X.Y.Z")
+        
+        # A prerelease is released by the smallest bump that reaches it,
+        # e.g. 1.2.0-rc1 -> 1.2.0 for a patch or minor change; build metadata is dropped
+        major, minor, patch = map(int, match.groups()[:3])
+        prerelease = match.group(4) is not None
+        if change_type == ChangeType.MAJOR:
+            if prerelease and minor == 0 and patch == 0:
+                return f"{major}.0.0"
+            return f"{major + 1}.0.0"
+        elif change_type == ChangeType.MINOR:
+            if prerelease and patch == 0:
+                return f"{major}.{minor}.0"
+            return f"{major}.{minor + 1}.0"
+        else:  # PATCH
+            if prerelease:
+                return f"{major}.{minor}.{patch}"
+            return f"{major}.{minor}.{patch + 1}"
     
     def update_cursor_rule(self, rule_path: Path, auto_version: bool = True) -> bool:
         """Update cursor rule with automatic versioning"""
+        return self._update_files('_prepare_cursor_rule', [rule_path], auto_version)
+    
+    def _prepare_cursor_rule(self, rule_path: Path, current_info: Dict,
+                             auto_version: bool) -> Tuple[bool, Optional[FileUpdate]]:
+        """Compute the versioned content of a cursor rule without touching the version database"""
         try:
-            with open(rule_path, 'r') as f:
-                data = yaml.safe_load(f)
+            raw = rule_path.read_bytes()
+            
+            # Calculate checksum
+            checksum = self._calculate_checksum(raw)
             
+            file_key = str(rule_path.relative_to(self.workspace_root))
+            
+            # Check if file changed; unchanged files were already parsed and validated
+            if current_info.get('checksum') == checksum:
+                print(f"No changes detected in {rule_path}")
+                return True, None
+            
+            data = _yaml_load(raw)
             if not data:
                 print(f"Error: Empty or invalid YAML file: {rule_path}")
-                return False
+                return False, None
             
             # Validate against schema
             is_valid, errors = self.validator.validate_cursor_rule(data)
@@ -225,33 +396,20 @@ class AutoVersionManager:
                 print(f"Schema validation failed for {rule_path}:")
                 for error in errors:
                     print(f"  - {error}")
-                return False
-            
-            # Calculate checksum
-            content = yaml.dump(data, default_flow_style=False)
-            checksum = self._calculate_checksum(content)
-            
-            # Get current version info
-            file_key = str(rule_path.relative_to(self.workspace_root))
-            current_info = self.version_db.get(file_key, {})
+                return False, None
             
-            # Check if file changed
-            if current_info.get('checksum') == checksum:
-                print(f"No changes detected in {rule_path}")
-                return True
-            
-            # Determine version bump
+            # Determine version bump; metadata updates below do not affect the summary
+            summary = self._summarize(data)
             current_version = current_info.get('version', '0.0.0')
             if auto_version and current_info:
-                # Load old data for comparison
-                old_data = current_info.get('data', {})
-                change_type = self._determine_version_bump(rule_path, old_data, data)
+                old_summary = self._previous_summary(current_info)
+                change_type = self._determine_version_bump(rule_path, old_summary, summary)
                 new_version = self._bump_version(current_version, change_type)
             else:
                 new_version = self._bump_version(current_version, ChangeType.PATCH)
             
             # Update metadata
-            now = datetime.datetime.now(datetime.timezone.utc)
+            now = self._run_now
             if 'metadata' not in data:
                 data['metadata'] = {}
             
@@ -259,40 +417,51 @@ class AutoVersionManager:
             data['metadata'].update({
                 'created': current_info.get('created', now.date().isoformat()),
                 'modified': now.isoformat(),
-                'schema_version': '1.0.0',
-                'checksum': checksum
+                'schema_version': '1.0.0'
             })
+            # Render updated file, recording the checksum of what will be on disk
+            out = self._render(data)
             
-            # Save updated file
-            with open(rule_path, 'w') as f:
-                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
-            
-            # Update version database
-            self.version_db[file_key] = {
+            info = {
                 'version': new_version,
                 'created': data['metadata']['created'],
                 'modified': data['metadata']['modified'],
                 'schema_version': '1.0.0',
-                'checksum': checksum,
-                'data': data
+                'checksum': self._calculate_checksum(out),
+                'summary': summary
             }
             
-            print(f"Updated {rule_path}: v{current_version} -> v{new_version}")
-            return True
+            message = f"Updated {rule_path}: v{current_version} -> v{new_version}"
+            return True, FileUpdate(rule_path, file_key, info, out, message)
             
         except Exception as e:
             print(f"Error updating cursor rule {rule_path}: {e}")
-            return False
+            return False, None
     
     def update_agent_spec(self, spec_path: Path, auto_version: bool = True) -> bool:
         """Update agent spec with automatic versioning"""
+        return self._update_files('_prepare_agent_spec', [spec_path], auto_version)
+    
+    def _prepare_agent_spec(self, spec_path: Path, current_info: Dict,
+                            auto_version: bool) -> Tuple[bool, Optional[FileUpdate]]:
+        """Compute the versioned content of an agent spec without touching the version database"""
         try:
-            with open(spec_path, 'r') as f:
-                data = yaml.safe_load(f)
+            raw = spec_path.read_bytes()
+            
+            # Calculate checksum
+            checksum = self._calculate_checksum(raw)
+            
+            file_key = str(spec_path.relative_to(self.workspace_root))
+            
+            # Check if file changed; unchanged files were already parsed and validated
+            if current_info.get('checksum') == checksum:
+                print(f"No changes detected in {spec_path}")
+                return True, None
             
+            data = _yaml_load(raw)
             if not data:
                 print(f"Error: Empty or invalid YAML file: {spec_path}")
-                return False
+                return False, None
             
             # Validate against schema
             is_valid, errors = self.validator.validate_agent_spec(data)
@@ -300,34 +469,21 @@ class AutoVersionManager:
                 print(f"Schema validation failed for {spec_path}:")
                 for error in errors:
                     print(f"  - {error}")
-                return False
-            
-            # Calculate checksum
-            content = yaml.dump(data, default_flow_style=False)
-            checksum = self._calculate_checksum(content)
+                return False, None
             
-            # Get current version info
-            file_key = str(spec_path.relative_to(self.workspace_root))
-            current_info = self.version_db.get(file_key, {})
-            
-            # Check if file changed
-            if current_info.get('checksum') == checksum:
-                print(f"No changes detected in {spec_path}")
-                return True
-            
-            # Determine version bump
+            # Determine version bump; metadata updates below do not affect the summary
+            summary = self._summarize(data)
             current_version = current_info.get('version', 'v0.0.0')
             if auto_version and current_info:
-                # Load old data for comparison
-                old_data = current_info.get('data', {})
-                change_type = self._determine_version_bump(spec_path, old_data, data)
+                old_summary = self._previous_summary(current_info)
+                change_type = self._determine_version_bump(spec_path, old_summary, summary)
                 new_version = self._bump_version(current_version.lstrip('v'), change_type)
                 new_version = f"v{new_version}"
             else:
                 new_version = f"v{self._bump_version(current_version.lstrip('v'), ChangeType.PATCH)}"
             
             # Update metadata
-            now = datetime.datetime.now(datetime.timezone.utc)
+            now = self._run_now
             if 'metadata' not in data:
                 data['metadata'] = {}
             
@@ -335,38 +491,79 @@ class AutoVersionManager:
                 'version': new_version,
                 'created': current_info.get('created', now.date().isoformat()),
                 'modified': now.isoformat(),
-                'schema_version': '1.0.0',
-                'checksum': checksum
+                'schema_version': '1.0.0'
             })
+            # Render updated file, recording the checksum of what will be on disk
+            out = self._render(data)
             
-            # Save updated file
-            with open(spec_path, 'w') as f:
-                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
-            
-            # Update version database
-            self.version_db[file_key] = {
+            info = {
                 'version': new_version,
                 'created': data['metadata']['created'],
                 'modified': data['metadata']['modified'],
                 'schema_version': '1.0.0',
-                'checksum': checksum,
-                'data': data
+                'checksum': self._calculate_checksum(out),
+                'summary': summary
             }
             
-            print(f"Updated {spec_path}: {current_version} -> {new_version}")
-            return True
+            message = f"Updated {spec_path}: {current_version} -> {new_version}"
+            return True, FileUpdate(spec_path, file_key, info, out, message)
             
         except Exception as e:
             print(f"Error updating agent spec {spec_path}: {e}")
+            return False, None
+    
+    def _current_info(self, path: Path) -> Dict:
+        """Look up the version database entry for a file"""
+        try:
+            return self.version_db.get(str(path.relative_to(self.workspace_root)), {})
+        except ValueError:
+            return {}
+    
+    def _update_files(self, prepare: str, paths: List[Path], auto_version: bool) -> bool:
+        """Prepare updates for files, in worker processes for larger batches, then apply them"""
+        tasks = [(prepare, path, self._current_info(path), auto_version) for path in paths]
+        
+        results = None
+        if len(tasks) >= MIN_PARALLEL_FILES:
+            try:
+                with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1),
+                                         initializer=_init_worker,
+                                         initargs=(self.workspace_root, self._run_now)) as executor:
+                    results = list(executor.map(_prepare_in_worker, tasks))
+            except (OSError, BrokenProcessPool) as e:
+                # Preparing has no side effects, so the batch can simply be redone here
+                print(f"Warning: worker processes unavailable ({e}), updating files sequentially")
+        
+        if results is None:
+            results = [getattr(self, prepare)(*task[1:]) for task in tasks]
+        
+        success = True
+        for ok, update in results:
+            if not ok:
+                success = False
+            elif update and not self._apply_update(update):
+                success = False
+        return success
+    
+    def _apply_update(self, update: FileUpdate) -> bool:
+        """Write a prepared update to disk and record it in the version database"""
+        try:
+            update.path.write_bytes(update.content)
+        except OSError as e:
+            print(f"Error writing {update.path}: {e}")
             return False
+        
+        self.version_db[update.file_key] = update.info
+        self._dirty = True
+        print(update.message)
+        return True
     
     def update_all_rules(self, auto_version: bool = True) -> bool:
         """Update all cursor rules"""
         success = True
         if self.cursor_rules_dir.exists():
-            for rule_file in self.cursor_rules_dir.glob('*.yaml'):
-                if not self.update_cursor_rule(rule_file, auto_version):
-                    success = False
+            rule_files = list(self.cursor_rules_dir.glob('*.yaml'))
+            success = self._update_files('_prepare_cursor_rule', rule_files, auto_version)
         
         self._save_version_db()
         return success
@@ -375,9 +572,8 @@ class AutoVersionManager:
         """Update all agent specifications"""
         success = True
         if self.agent_specs_dir.exists():
-            for spec_file in self.agent_specs_dir.rglob('*.yaml'):
-                if not self.update_agent_spec(spec_file, auto_version):
-                    success = False
+            spec_files = [Path(p) for p in _iter_yaml_files(str(self.agent_specs_dir))]
+            success = self._update_files('_prepare_agent_spec', spec_files, auto_version)
         
         self._save_version_db()
         return success
@@ -389,6 +585,8 @@ class AutoVersionManager:
         return rules_success and specs_success
 
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(description='Automatic versioning for cursor rules and agent specs')
     parser.add_argument('--workspace', type=Path, default=Path.cwd(), help='Workspace root directory')
     parser.add_argument('--file', type=Path, help='Update specific file')
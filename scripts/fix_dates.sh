@@ -5,6 +5,29 @@
 
 set -euo pipefail
 
+usage() {
+    echo "Usage: $0 [--dry-run]"
+    echo "  --dry-run  Report the files that would change without rewriting them"
+}
+
+DRY_RUN=false
+for arg in "$@"; do
+    case "$arg" in
+        --dry-run)
+            DRY_RUN=true
+            ;;
+        -h|--help)
+            usage
+            exit 0
+            ;;
+        *)
+            echo "Unknown argument: $arg" >&2
+            usage >&2
+            exit 2
+            ;;
+    esac
+done
+
 # Get canonical current date
 TODAY=$(date -u +%Y-%m-%d)
 echo "Canonical date: $TODAY"
@@ -20,26 +43,60 @@ HALLUCINATED_DATES=(
     "2025-01-10"
 )
 
-# Function to fix dates in a file
-fix_dates_in_file() {
-    local file="$1"
-    local changed=false
+# Single alternation of all hallucinated dates, so each file is scanned once
+DATE_PATTERN=$(IFS='|'; echo "${HALLUCINATED_DATES[*]}")
+
+# The dates are plain literals, so the scan uses grep's fixed-string
+# multi-pattern matcher rather than the regex engine
+DATE_LITERALS=()
+for bad_date in "${HALLUCINATED_DATES[@]}"; do
+    DATE_LITERALS+=(-e "$bad_date")
+done
+
+# Scan and rewrite file batches in parallel across all cores
+JOBS=$(nproc 2>/dev/null || echo 4)
+
+# The dates are ASCII, so grep and sed can match bytes in the C locale
+# instead of decoding multibyte characters
+export LC_ALL=C
+
+# Function to fix dates in a batch of files; grep and sed each compile
+# the pattern once per batch instead of once per file
+fix_dates_in_files() {
+    (( $# > 0 )) || return 0
+    local file bad_date line matches last=""
+    local -a changed=()
+    
+    echo "Checking $# files"
     
-    echo "Checking: $file"
+    matches=$(printf '%s\0' "$@" \
+        | xargs -0 -P "$JOBS" -n 64 grep --line-buffered -oHF "${DATE_LITERALS[@]}" 2>/dev/null \
+        | sort -u) || true
+    [[ -n "$matches" ]] || return 0
     
-    for bad_date in "${HALLUCINATED_DATES[@]}"; do
-        if grep -q "$bad_date" "$file" 2>/dev/null; then
+    while read -r line; do
+        file="${line%:*}"
+        bad_date="${line##*:}"
+        if [[ "$DRY_RUN" == true ]]; then
+            echo "  Would fix $bad_date -> $TODAY in $file"
+        else
             echo "  Fixing $bad_date -> $TODAY in $file"
-            sed -i "s/$bad_date/$TODAY/g" "$file"
-            changed=true
         fi
-    done
+        if [[ "$file" != "$last" ]]; then
+            changed+=("$file")
+            last="$file"
+        fi
+    done <<< "$matches"
+    [[ "$DRY_RUN" == false ]] || return 0
     
-    if [[ "$changed" == "true" ]]; then
-        echo "  ✅ Fixed dates in $file"
-    fi
+    printf '%s\0' "${changed[@]}" \
+        | xargs -0 -P "$JOBS" -n 16 sed -i -E "s/$DATE_PATTERN/$TODAY/g"
+    printf '  ✅ Fixed dates in %s\n' "${changed[@]}"
 }
 
+# Directories never worth descending into: build output, VCS, dependencies
+PRUNE_DIRS=(-name target -o -name .git -o -name node_modules -o -name __pycache__)
+
 # Core workspace crates to prioritize
 CORE_CRATES=(
     "crates/toka-types"
@@ -53,34 +110,28 @@ CORE_CRATES=(
 )
 
 echo "=== Fixing Core Workspace Crates ==="
+crate_dirs=()
 for crate_dir in "${CORE_CRATES[@]}"; do
     if [[ -d "$crate_dir" ]]; then
         echo "Processing core crate: $crate_dir"
-        
-        # Fix Cargo.toml files
-        find "$crate_dir" -name "Cargo.toml" -type f | while read -r file; do
-            fix_dates_in_file "$file"
-        done
-        
-        # Fix Rust source files
-        find "$crate_dir" -name "*.rs" -type f | while read -r file; do
-            fix_dates_in_file "$file"
-        done
-        
-        # Fix documentation
-        find "$crate_dir" -name "*.md" -type f | while read -r file; do
-            fix_dates_in_file "$file"
-        done
+        crate_dirs+=("$crate_dir")
     else
         echo "⚠️  Core crate not found: $crate_dir"
     fi
 done
 
+# Fix Cargo.toml files, Rust sources and documentation in one tree walk
+if (( ${#crate_dirs[@]} > 0 )); then
+    mapfile -d '' -t files < <(find "${crate_dirs[@]}" -type d \( "${PRUNE_DIRS[@]}" \) -prune \
+        -o -type f \( -name "Cargo.toml" -o -name "*.rs" -o -name "*.md" \) -print0)
+    fix_dates_in_files "${files[@]}"
+fi
+
 # Fix agent specifications
 echo "=== Fixing Agent Specifications ==="
-find "agents-specs" -name "*.yaml" -type f | while read -r file; do
-    fix_dates_in_file "$file"
-done
+mapfile -d '' -t files < <(find "agents-specs" -type d \( "${PRUNE_DIRS[@]}" \) -prune \
+    -o -type f -name "*.yaml" -print0)
+fix_dates_in_files "${files[@]}"
 
 # Fix documentation reports with specific date hallucinations
 echo "=== Fixing Documentation Reports ==="
@@ -98,11 +149,18 @@ DOCS_WITH_DATES=(
     "crates/security/CRITICAL_ISSUES.md"
 )
 
+files=()
 for doc_file in "${DOCS_WITH_DATES[@]}"; do
     if [[ -f "$doc_file" ]]; then
-        fix_dates_in_file "$doc_file"
+        files+=("$doc_file")
     fi
 done
+fix_dates_in_files "${files[@]}"
+
+if [[ "$DRY_RUN" == true ]]; then
+    echo "=== Dry Run: no files were modified ==="
+    exit 0
+fi
 
 echo "=== Date Fix Summary ==="
 echo "✅ Fixed hallucinated dates in core workspace crates"